@@ -6,19 +6,29 @@ Demonstrates various Python language features for semantic token testing
 
 import asyncio
 import json
+import re
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from enum import Enum, auto
-from typing import Dict, List, Optional, Union, Generic, TypeVar, Protocol
-from functools import wraps, lru_cache
+from enum import Enum, IntFlag, auto
+from typing import Dict, List, NamedTuple, Optional, Union, Generic, TypeVar, Protocol
+from functools import wraps
+from itertools import islice
+from time import monotonic as _monotonic
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Precompiled validators
+_EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
+# Reusable compact JSON encoder (built once, shared by all serializers)
+_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
 # Type variables and protocols
-T = TypeVar('T')
+T = TypeVar('T', bound='Identifiable')
 U = TypeVar('U', bound='BaseEntity')
 
 class Serializable(Protocol):
@@ -26,23 +36,35 @@ class Serializable(Protocol):
     def to_dict(self) -> Dict[str, any]:
         ...
 
+class Identifiable(Protocol):
+    """Protocol for objects exposing an integer id"""
+    @property
+    def id(self) -> int:
+        ...
+
 # Enums
-class UserRole(Enum):
-    """User role enumeration"""
+class UserRole(IntFlag):
+    """User role bit flags (combinable with |)"""
     ADMIN = auto()
     USER = auto()
     MODERATOR = auto()
     GUEST = auto()
 
 class Status(Enum):
-    """Status enumeration with string values"""
-    ACTIVE = "active"
-    INACTIVE = "inactive"
-    PENDING = "pending"
-    SUSPENDED = "suspended"
+    """Status enumeration with interned string values"""
+    ACTIVE = sys.intern("active")
+    INACTIVE = sys.intern("inactive")
+    PENDING = sys.intern("pending")
+    SUSPENDED = sys.intern("suspended")
+
+# Cached value->member map (avoids Enum.__call__ overhead per lookup)
+_STATUS_BY_VALUE: Dict[str, Status] = {status.value: status for status in Status}
+
+# Cached member set for O(1) validity checks (enum members hash by identity)
+_STATUS_MEMBERS = frozenset(Status)
 
 # Dataclasses
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Address:
     """Address dataclass with validation"""
     street: str
@@ -55,31 +77,43 @@ class Address:
         if len(self.zip_code) != 5:
             raise ValueError("ZIP code must be 5 digits")
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserProfile:
     """User profile with default factory"""
     user_id: int
     username: str
     email: str
-    roles: List[UserRole] = field(default_factory=list)
+    roles: UserRole = UserRole(0)
     metadata: Dict[str, any] = field(default_factory=dict)
     address: Optional[Address] = None
     
     @property
     def is_admin(self) -> bool:
-        return UserRole.ADMIN in self.roles
+        return bool(self.roles & UserRole.ADMIN)
     
     @property
     def display_name(self) -> str:
         return self.metadata.get('display_name', self.username)
 
+# Lightweight record types
+class UserRecord(NamedTuple):
+    """Immutable flat snapshot of a user (tuple layout, no __dict__)"""
+    id: int
+    username: str
+    email: str
+    status: str
+    created_at: float
+    profile: Optional[UserProfile]
+
 # Abstract base classes
 class BaseEntity(ABC):
     """Abstract base entity class"""
-    
+
+    __slots__ = ('_id', '_created_at')
+
     def __init__(self, entity_id: int):
         self._id = entity_id
-        self._created_at = asyncio.get_event_loop().time()
+        self._created_at = _monotonic()
     
     @property
     def id(self) -> int:
@@ -104,12 +138,14 @@ def deprecated(func):
     """Decorator to mark functions as deprecated"""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        logger.warning(f"Function {func.__name__} is deprecated")
+        logger.warning("Function %s is deprecated", func.__name__)
         return func(*args, **kwargs)
     return wrapper
 
 def retry(max_attempts: int = 3):
     """Retry decorator with configurable attempts"""
+    backoff_delays = tuple(2 ** attempt for attempt in range(max_attempts))
+
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -119,8 +155,8 @@ def retry(max_attempts: int = 3):
                 except Exception as e:
                     if attempt == max_attempts - 1:
                         raise
-                    logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                    await asyncio.sleep(2 ** attempt)
+                    logger.warning("Attempt %d failed: %s", attempt + 1, e)
+                    await asyncio.sleep(backoff_delays[attempt])
         return wrapper
     return decorator
 
@@ -130,30 +166,75 @@ class Repository(Generic[T]):
     
     def __init__(self):
         self._items: List[T] = []
-    
+        self._index: Dict[int, T] = {}
+
     def add(self, item: T) -> None:
         """Add item to repository"""
         self._items.append(item)
-    
+        self._index[item.id] = item
+
     def find_by_id(self, item_id: int) -> Optional[T]:
         """Find item by ID"""
-        for item in self._items:
-            if hasattr(item, 'id') and item.id == item_id:
-                return item
-        return None
+        return self._index.get(item_id)
     
+    def __len__(self) -> int:
+        return len(self._items)
+
     def get_all(self) -> List[T]:
-        """Get all items"""
+        """Get all items as an isolated copy"""
         return self._items.copy()
-    
+
+    def iter_all(self):
+        """Iterate items without copying"""
+        return iter(self._items)
+
     def filter(self, predicate) -> List[T]:
         """Filter items by predicate"""
         return [item for item in self._items if predicate(item)]
 
+# Structure-of-arrays storage for bulk operations
+class UserColumns:
+    """Column-oriented user storage (one list per field)"""
+
+    __slots__ = ('ids', 'usernames', 'emails', 'statuses')
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.usernames: List[str] = []
+        self.emails: List[str] = []
+        self.statuses: List[Status] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, user_id: int, username: str, email: str,
+               status: Status = Status.PENDING) -> None:
+        """Append one user row across all columns"""
+        self.ids.append(user_id)
+        self.usernames.append(username)
+        self.emails.append(email)
+        self.statuses.append(status)
+
+    def row(self, index: int) -> 'User':
+        """Materialize a single row as a User entity"""
+        user = User(self.ids[index], self.usernames[index], self.emails[index])
+        user.status = self.statuses[index]
+        return user
+
+    def validate_all(self) -> List[bool]:
+        """Validate every row in one pass over the columns"""
+        match = _EMAIL_RE.fullmatch
+        return [
+            len(username) >= 3 and match(email) is not None
+            for username, email in zip(self.usernames, self.emails)
+        ]
+
 # Concrete implementation
 class User(BaseEntity):
     """User entity implementation"""
-    
+
+    __slots__ = ('username', 'email', 'profile', '_status')
+
     def __init__(self, user_id: int, username: str, email: str):
         super().__init__(user_id)
         self.username = username
@@ -167,15 +248,19 @@ class User(BaseEntity):
     
     @status.setter
     def status(self, value: Status) -> None:
-        if not isinstance(value, Status):
+        if value not in _STATUS_MEMBERS:
             raise TypeError("Status must be a Status enum value")
         self._status = value
+
+    @property
+    def is_active(self) -> bool:
+        return self._status is Status.ACTIVE
     
     def validate(self) -> bool:
         """Validate user data"""
         if not self.username or len(self.username) < 3:
             return False
-        if '@' not in self.email:
+        if not _EMAIL_RE.fullmatch(self.email):
             return False
         return True
     
@@ -190,6 +275,15 @@ class User(BaseEntity):
             'profile': self.profile.to_dict() if self.profile else None
         }
     
+    def to_record(self) -> UserRecord:
+        """Snapshot user fields into an immutable UserRecord"""
+        return UserRecord(self.id, self.username, self.email,
+                          self.status.value, self.created_at, self.profile)
+
+    def to_json(self) -> str:
+        """Serialize user straight to a compact JSON string"""
+        return _JSON_ENCODER.encode(self.to_dict())
+
     @deprecated
     def old_method(self) -> str:
         """This method is deprecated"""
@@ -207,7 +301,7 @@ class User(BaseEntity):
         """Create user from dictionary"""
         user = cls(data['id'], data['username'], data['email'])
         if 'status' in data:
-            user.status = Status(data['status'])
+            user.status = _STATUS_BY_VALUE[data['status']]
         return user
 
 # Service classes with async methods
@@ -216,19 +310,19 @@ class UserService:
     
     def __init__(self):
         self._repository: Repository[User] = Repository()
-        self._cache: Dict[int, User] = {}
+        self._by_email: Dict[str, User] = {}
     
     async def create_user(self, username: str, email: str) -> User:
         """Create a new user asynchronously"""
-        user_id = len(self._repository.get_all()) + 1
+        user_id = len(self._repository) + 1
         user = User(user_id, username, email)
         
         if not user.validate():
             raise ValueError("Invalid user data")
         
         self._repository.add(user)
-        self._cache[user.id] = user
-        
+        self._by_email[email] = user
+
         logger.info(f"Created user: {username}")
         return user
     
@@ -243,57 +337,73 @@ class UserService:
             return user.to_dict()
         return None
     
-    @lru_cache(maxsize=128)
     def get_user_by_email(self, email: str) -> Optional[User]:
-        """Get user by email with caching"""
-        users = self._repository.get_all()
-        for user in users:
-            if user.email == email:
-                return user
-        return None
+        """Get user by email via hash index"""
+        return self._by_email.get(email)
     
     async def batch_process_users(self, user_data: List[Dict[str, any]]) -> List[User]:
-        """Process multiple users concurrently"""
-        tasks = []
-        for data in user_data:
-            task = self.create_user(data['username'], data['email'])
-            tasks.append(task)
-        
-        return await asyncio.gather(*tasks, return_exceptions=True)
+        """Create multiple users in one validated bulk pass"""
+        next_id = len(self._repository) + 1
+        users = [
+            User(next_id + offset, data['username'], data['email'])
+            for offset, data in enumerate(user_data)
+        ]
+
+        if not all(user.validate() for user in users):
+            raise ValueError("Invalid user data in batch")
+
+        for user in users:
+            self._repository.add(user)
+            self._by_email[user.email] = user
+
+        logger.info(f"Created {len(users)} users in bulk")
+        return users
 
 # Context managers
 class DatabaseConnection:
-    """Database connection context manager"""
-    
+    """Async database connection context manager with pooling"""
+
+    _pool: List[Dict[str, any]] = []
+
     def __init__(self, connection_string: str):
         self.connection_string = connection_string
         self.connection = None
-    
-    def __enter__(self):
-        logger.info(f"Connecting to database: {self.connection_string}")
-        # Simulate connection
-        self.connection = {"connected": True}
+
+    async def __aenter__(self):
+        if DatabaseConnection._pool:
+            self.connection = DatabaseConnection._pool.pop()
+            logger.info(f"Reusing pooled connection to: {self.connection_string}")
+        else:
+            logger.info(f"Connecting to database: {self.connection_string}")
+            # Simulate connection handshake
+            await asyncio.sleep(0)
+            self.connection = {"connected": True}
         return self.connection
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        logger.info("Closing database connection")
-        self.connection = None
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
         if exc_type:
             logger.error(f"Exception occurred: {exc_val}")
+            logger.info("Closing database connection")
+        else:
+            # Healthy connections go back to the pool for reuse
+            DatabaseConnection._pool.append(self.connection)
+        self.connection = None
         return False
 
 # Generators and iterators
-def fibonacci_generator(n: int):
-    """Generate Fibonacci sequence up to n terms"""
+def fibonacci_sequence(n: int) -> List[int]:
+    """Compute n Fibonacci terms into a preallocated list"""
+    result = [0] * n
     a, b = 0, 1
-    for _ in range(n):
-        yield a
+    for i in range(n):
+        result[i] = a
         a, b = b, a + b
+    return result
 
 def process_users_in_batches(users: List[User], batch_size: int = 10):
     """Process users in batches using generator"""
-    for i in range(0, len(users), batch_size):
-        batch = users[i:i + batch_size]
+    iterator = iter(users)
+    while batch := list(islice(iterator, batch_size)):
         yield batch
 
 # Exception handling
@@ -326,12 +436,12 @@ async def main():
         
         batch_results = await service.batch_process_users(user_data)
         
-        # Use context manager
-        with DatabaseConnection("postgresql://localhost:5432/testdb") as conn:
+        # Use async context manager
+        async with DatabaseConnection("postgresql://localhost:5432/testdb") as conn:
             logger.info(f"Connection status: {conn['connected']}")
         
-        # Generator usage
-        fib_numbers = list(fibonacci_generator(10))
+        # Sequence computation
+        fib_numbers = fibonacci_sequence(10)
         logger.info(f"Fibonacci numbers: {fib_numbers}")
         
     except (UserNotFoundError, ValidationError) as e: